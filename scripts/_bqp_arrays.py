@@ -0,0 +1,125 @@
+import os
+import bqpjson
+import json
+import numpy as np
+
+
+def read_bqpjson(path: str, validate: bool = True) -> dict:
+    # Check for existence of the input file.
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+
+    # Read the input file and parse the JSON data.
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    # Validate data against bqpjson schema, unless the instance is trusted.
+    if validate:
+        bqpjson.validate(data)
+
+    # Return the parsed JSON data.
+    return data
+
+
+def _compact(coeffs: np.ndarray) -> np.ndarray:
+    """
+    Store coefficients in the smallest type that represents them exactly:
+    int16 if they are all integers in its range, float32 if they survive the
+    conversion unchanged, and float64 otherwise.
+    """
+
+    if np.all(np.mod(coeffs, 1.0) == 0.0) and np.all(np.abs(coeffs) < 32768):
+        return coeffs.astype(np.int16)
+    elif np.array_equal(coeffs.astype(np.float32), coeffs):
+        return coeffs.astype(np.float32)
+    else:
+        return coeffs
+
+
+def prepare_arrays(data: dict) -> tuple:
+    """
+    Convert the terms of an Ising instance to arrays indexed by the position of
+    each variable in `data["variable_ids"]`. Returns a tuple containing the
+    linear coefficients, quadratic coefficients, and tail and head indices.
+    Coefficients are stored in compact types where this is lossless.
+    """
+
+    # Map each variable id to its position in the list of variable ids.
+    vid_to_idx = {vid: i for (i, vid) in enumerate(data["variable_ids"])}
+
+    # Accumulate the linear coefficients into a dense vector, summing the
+    # coefficients of any repeated variable ids.
+    linear_terms = data["linear_terms"]
+    count = len(linear_terms)
+    idx = np.fromiter((vid_to_idx[lt["id"]] for lt in linear_terms), dtype=np.int32, count=count)
+    h = np.zeros(len(vid_to_idx), dtype=np.float64)
+    np.add.at(h, idx, np.fromiter((lt["coeff"] for lt in linear_terms), dtype=np.float64, count=count))
+
+    # Store the quadratic terms as parallel arrays of coefficients and indices.
+    quadratic_terms = data["quadratic_terms"]
+    count = len(quadratic_terms)
+    Jc = np.fromiter((qt["coeff"] for qt in quadratic_terms), dtype=np.float64, count=count)
+    tail = np.fromiter((vid_to_idx[qt["id_tail"]] for qt in quadratic_terms), dtype=np.int32, count=count)
+    head = np.fromiter((vid_to_idx[qt["id_head"]] for qt in quadratic_terms), dtype=np.int32, count=count)
+
+    return _compact(h), _compact(Jc), tail, head
+
+
+def load_or_build(instance_path: str, validate: bool = True) -> dict:
+    """
+    Load the arrays of an Ising instance from the `.arrays.npz` cache stored
+    next to its JSON file. If the cache is missing or older than the instance,
+    it is rebuilt from the JSON data. Returns a dictionary with the arrays of
+    `prepare_arrays`, the variable ids, and the variable domain. Since the
+    cache is only written from validated data, a cached instance is never
+    validated again.
+    """
+
+    cache_path = instance_path + ".arrays.npz"
+
+    # Check for existence of the input file.
+    if not os.path.exists(instance_path):
+        raise FileNotFoundError(f"File not found: {instance_path}")
+
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(instance_path):
+        with np.load(cache_path) as cache:
+            return {
+                "h": cache["h"],
+                "Jc": cache["Jc"],
+                "tail": cache["tail"],
+                "head": cache["head"],
+                "variable_ids": cache["variable_ids"],
+                "variable_domain": str(cache["variable_domain"])
+            }
+
+    data = read_bqpjson(instance_path, validate)
+    h, Jc, tail, head = prepare_arrays(data)
+
+    arrays = {
+        "h": h,
+        "Jc": Jc,
+        "tail": tail,
+        "head": head,
+        "variable_ids": np.array(data["variable_ids"]),
+        "variable_domain": data["variable_domain"]
+    }
+
+    # Unvalidated data is not cached, as the cache is trusted when loaded.
+    if not validate:
+        return arrays
+
+    # Write the cache to a temporary file first so that concurrent runs never
+    # read a partially written cache. Caching is skipped if the instance
+    # directory is not writable.
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+
+    try:
+        with open(temporary_path, "wb") as f:
+            np.savez(f, **arrays)
+
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+    return arrays
@@ -0,0 +1,223 @@
+/*
+ * AVX2 kernel for the quadratic part of the energy of an Ising assignment.
+ *
+ * Since spins are +1 or -1, each product `Jc[k] * s[tail[k]] * s[head[k]]`
+ * equals `Jc[k]` with its sign flipped whenever the two spins differ. The
+ * float32 kernel builds those sign flips as sign-bit masks, applies them to
+ * eight coefficients at a time with `_mm256_xor_ps`, and accumulates the
+ * results in double precision. The int16 kernel negates the flipped terms in
+ * integer arithmetic and accumulates them exactly in 64-bit integers.
+ *
+ * The AVX2 code is compiled through a `target` attribute, so the module can
+ * be imported on any x86 processor; `has_avx2()` reports whether it can run.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stddef.h>
+#include <stdint.h>
+
+#if (defined(__x86_64__) || defined(__i386__)) && defined(__GNUC__)
+#define ENERGY_C_X86 1
+#include <immintrin.h>
+#endif
+
+#ifdef ENERGY_C_X86
+__attribute__((target("avx2")))
+double energy_avx2(const float* Jc, const int32_t* tail, const int32_t* head, const int8_t* s, size_t m)
+{
+    __m256d acc_lo = _mm256_setzero_pd();
+    __m256d acc_hi = _mm256_setzero_pd();
+    uint32_t sign_bits[8];
+    size_t k = 0;
+
+    for (; k + 8 <= m; k += 8) {
+        /* Spins are stored as 0x01 or 0xFF, so the top bit of their XOR is
+         * set exactly when the two spins differ. */
+        for (int lane = 0; lane < 8; ++lane) {
+            sign_bits[lane] = (uint32_t)((s[tail[k + lane]] ^ s[head[k + lane]]) & 0x80) << 24;
+        }
+
+        __m256 coeffs = _mm256_loadu_ps(Jc + k);
+        __m256 signs = _mm256_castsi256_ps(_mm256_loadu_si256((const __m256i*)sign_bits));
+        __m256 terms = _mm256_xor_ps(coeffs, signs);
+
+        acc_lo = _mm256_add_pd(acc_lo, _mm256_cvtps_pd(_mm256_castps256_ps128(terms)));
+        acc_hi = _mm256_add_pd(acc_hi, _mm256_cvtps_pd(_mm256_extractf128_ps(terms, 1)));
+    }
+
+    /* Horizontally sum the accumulators. */
+    __m256d acc = _mm256_add_pd(acc_lo, acc_hi);
+    __m128d sum = _mm_add_pd(_mm256_castpd256_pd128(acc), _mm256_extractf128_pd(acc, 1));
+    double e = _mm_cvtsd_f64(_mm_add_sd(sum, _mm_unpackhi_pd(sum, sum)));
+
+    /* Handle the remaining terms one at a time. */
+    for (; k < m; ++k) {
+        e += (double)Jc[k] * s[tail[k]] * s[head[k]];
+    }
+
+    return e;
+}
+
+__attribute__((target("avx2")))
+int64_t energy_avx2_i16(const int16_t* Jc, const int32_t* tail, const int32_t* head, const int8_t* s, size_t m)
+{
+    __m256i acc = _mm256_setzero_si256();
+    int32_t flip_masks[8];
+    size_t k = 0;
+
+    for (; k + 8 <= m; k += 8) {
+        /* All bits are set in the mask exactly when the two spins differ. */
+        for (int lane = 0; lane < 8; ++lane) {
+            flip_masks[lane] = -(int32_t)(s[tail[k + lane]] != s[head[k + lane]]);
+        }
+
+        /* Widen the coefficients to 32 bits and negate the flipped lanes,
+         * using `(x ^ mask) - mask`. */
+        __m256i coeffs = _mm256_cvtepi16_epi32(_mm_loadu_si128((const __m128i*)(Jc + k)));
+        __m256i masks = _mm256_loadu_si256((const __m256i*)flip_masks);
+        __m256i terms = _mm256_sub_epi32(_mm256_xor_si256(coeffs, masks), masks);
+
+        acc = _mm256_add_epi64(acc, _mm256_cvtepi32_epi64(_mm256_castsi256_si128(terms)));
+        acc = _mm256_add_epi64(acc, _mm256_cvtepi32_epi64(_mm256_extracti128_si256(terms, 1)));
+    }
+
+    /* Horizontally sum the accumulator. */
+    int64_t lanes[4];
+    _mm256_storeu_si256((__m256i*)lanes, acc);
+    int64_t e = lanes[0] + lanes[1] + lanes[2] + lanes[3];
+
+    /* Handle the remaining terms one at a time. */
+    for (; k < m; ++k) {
+        e += (int64_t)Jc[k] * s[tail[k]] * s[head[k]];
+    }
+
+    return e;
+}
+#endif
+
+static int cpu_has_avx2(void)
+{
+#ifdef ENERGY_C_X86
+    __builtin_cpu_init();
+    return __builtin_cpu_supports("avx2");
+#else
+    return 0;
+#endif
+}
+
+static PyObject* py_has_avx2(PyObject* self, PyObject* args)
+{
+    return PyBool_FromLong(cpu_has_avx2());
+}
+
+static int spins_are_signs(const int8_t* s, Py_ssize_t n)
+{
+    for (Py_ssize_t i = 0; i < n; ++i) {
+        if (s[i] != 1 && s[i] != -1) {
+            return 0;
+        }
+    }
+
+    return 1;
+}
+
+static int indices_in_range(const int32_t* idx, size_t m, Py_ssize_t n)
+{
+    for (size_t k = 0; k < m; ++k) {
+        if (idx[k] < 0 || idx[k] >= n) {
+            return 0;
+        }
+    }
+
+    return 1;
+}
+
+static PyObject* energy_dispatch(PyObject* args, size_t coeff_size)
+{
+    Py_buffer Jc, tail, head, s;
+    PyObject* result = NULL;
+
+    if (!PyArg_ParseTuple(args, "y*y*y*y*", &Jc, &tail, &head, &s)) {
+        return NULL;
+    }
+
+    size_t m = (size_t)Jc.len / coeff_size;
+
+    if (!cpu_has_avx2()) {
+        PyErr_SetString(PyExc_RuntimeError, "AVX2 is not supported on this processor.");
+    } else if ((size_t)tail.len != m * sizeof(int32_t) || (size_t)head.len != m * sizeof(int32_t)) {
+        PyErr_SetString(PyExc_ValueError, "Coefficient and index buffers must have the same length.");
+    } else if (!indices_in_range((const int32_t*)tail.buf, m, s.len) || !indices_in_range((const int32_t*)head.buf, m, s.len)) {
+        PyErr_SetString(PyExc_ValueError, "Tail and head indices must be valid positions in the spin buffer.");
+    } else if (!spins_are_signs((const int8_t*)s.buf, s.len)) {
+        /* Both kernels derive each term's sign from the spins, so any value
+         * other than +1 or -1 would silently give a wrong energy. */
+        PyErr_SetString(PyExc_ValueError, "Spins must all be +1 or -1.");
+    } else {
+#ifdef ENERGY_C_X86
+        if (coeff_size == sizeof(float)) {
+            double e;
+
+            Py_BEGIN_ALLOW_THREADS
+            e = energy_avx2((const float*)Jc.buf, (const int32_t*)tail.buf, (const int32_t*)head.buf, (const int8_t*)s.buf, m);
+            Py_END_ALLOW_THREADS
+
+            result = PyFloat_FromDouble(e);
+        } else {
+            int64_t e;
+
+            Py_BEGIN_ALLOW_THREADS
+            e = energy_avx2_i16((const int16_t*)Jc.buf, (const int32_t*)tail.buf, (const int32_t*)head.buf, (const int8_t*)s.buf, m);
+            Py_END_ALLOW_THREADS
+
+            result = PyLong_FromLongLong(e);
+        }
+#endif
+    }
+
+    PyBuffer_Release(&Jc);
+    PyBuffer_Release(&tail);
+    PyBuffer_Release(&head);
+    PyBuffer_Release(&s);
+
+    return result;
+}
+
+static PyObject* py_energy_avx2(PyObject* self, PyObject* args)
+{
+    return energy_dispatch(args, sizeof(float));
+}
+
+static PyObject* py_energy_avx2_i16(PyObject* self, PyObject* args)
+{
+    return energy_dispatch(args, sizeof(int16_t));
+}
+
+static PyMethodDef energy_c_methods[] = {
+    {"has_avx2", py_has_avx2, METH_NOARGS, "Return whether the processor supports AVX2."},
+    {
+        "energy_avx2", py_energy_avx2, METH_VARARGS,
+        "energy_avx2(Jc, tail, head, s)\n\n"
+        "Compute the quadratic energy of an assignment of spins. Expects contiguous\n"
+        "float32 coefficients, int32 tail and head indices into `s`, and int8 spins\n"
+        "that are all +1 or -1."
+    },
+    {
+        "energy_avx2_i16", py_energy_avx2_i16, METH_VARARGS,
+        "energy_avx2_i16(Jc, tail, head, s)\n\n"
+        "Compute the quadratic energy of an assignment of spins as an integer. Expects\n"
+        "contiguous int16 coefficients, int32 tail and head indices into `s`, and int8\n"
+        "spins that are all +1 or -1."
+    },
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef energy_c_module = {
+    PyModuleDef_HEAD_INIT, "_energy_c", "AVX2 energy kernels for Ising models.", -1, energy_c_methods
+};
+
+PyMODINIT_FUNC PyInit__energy_c(void)
+{
+    return PyModule_Create(&energy_c_module);
+}
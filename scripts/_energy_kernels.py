@@ -0,0 +1,188 @@
+import numba
+import numpy as np
+
+try:
+    # Optional AVX2 kernel, built with `python3 setup.py build_ext --inplace`.
+    import _energy_c
+    HAS_AVX2 = _energy_c.has_avx2()
+except ImportError:
+    HAS_AVX2 = False
+
+# Number of quadratic terms above which the quadratic sum is split across threads.
+PARALLEL_THRESHOLD = 1 << 16
+
+# Kernels are compiled ahead of their first call for C-contiguous arrays, with
+# one signature per coefficient type produced by `_bqp_arrays.prepare_arrays`.
+# Linear coefficients are passed as float64. Spins are int8, or float64 for
+# assignments that are evaluated as parsed (e.g., from a result log).
+_COEFF_TYPES = ("i2", "f4", "f8")
+_SPIN_TYPES = ("i1", "f8")
+_ENERGY_SIGNATURES = [
+    f"f8(f8[::1], {t}[::1], i4[::1], i4[::1], {u}[::1])" for t in _COEFF_TYPES for u in _SPIN_TYPES
+]
+_SWEEP_SIGNATURES = [f"f8(f8[::1], {t}[::1], i4[::1], i4[::1], i8, i8, i8)" for t in _COEFF_TYPES]
+
+
+def _contiguous(h: np.ndarray, Jc: np.ndarray, tail: np.ndarray, head: np.ndarray) -> tuple:
+    """
+    Convert the arrays of an Ising instance to the layouts and types expected
+    by the compiled kernels.
+    """
+
+    return (
+        np.ascontiguousarray(h, dtype=np.float64),
+        np.ascontiguousarray(Jc),
+        np.ascontiguousarray(tail, dtype=np.int32),
+        np.ascontiguousarray(head, dtype=np.int32)
+    )
+
+
+@numba.njit(_ENERGY_SIGNATURES, cache=True, fastmath=True)
+def _energy_serial(h, Jc, tail, head, s):
+    """
+    Compute the energy of an assignment of spins, `s`, in a single pass over
+    the linear and quadratic terms.
+    """
+
+    e = 0.0
+
+    for i in range(h.size):
+        e += h[i] * s[i]
+
+    for k in range(Jc.size):
+        e += Jc[k] * s[tail[k]] * s[head[k]]
+
+    return e
+
+
+@numba.njit(_ENERGY_SIGNATURES, cache=True, fastmath=True, parallel=True)
+def _energy_parallel(h, Jc, tail, head, s):
+    """
+    Compute the energy of an assignment of spins, `s`, with the quadratic terms
+    reduced in parallel.
+    """
+
+    e = 0.0
+
+    for i in range(h.size):
+        e += h[i] * s[i]
+
+    for k in numba.prange(Jc.size):
+        e += Jc[k] * s[tail[k]] * s[head[k]]
+
+    return e
+
+
+def _is_spin_assignment(s: np.ndarray) -> bool:
+    """
+    Check whether every value of the assignment `s` is a spin (+1 or -1).
+    """
+
+    return bool(np.all((s == 1) | (s == -1)))
+
+
+def compute_energy(h: np.ndarray, Jc: np.ndarray, tail: np.ndarray, head: np.ndarray, s: np.ndarray) -> float:
+    """
+    Compute the energy of an assignment of spins, `s`, for a given Ising
+    instance stored as arrays. The quadratic terms are summed by the AVX2
+    kernel matching the type of `Jc` (int16 or float32) when it is available
+    and `s` only holds +1 and -1, since those kernels compute each term from
+    the signs of the spins; otherwise, large instances use the parallel Numba
+    kernel.
+    """
+
+    if HAS_AVX2 and Jc.dtype in (np.int16, np.float32) and _is_spin_assignment(s):
+        kernel = _energy_c.energy_avx2_i16 if Jc.dtype == np.int16 else _energy_c.energy_avx2
+
+        quadratic_energy = kernel(
+            np.ascontiguousarray(Jc),
+            np.ascontiguousarray(tail, dtype=np.int32),
+            np.ascontiguousarray(head, dtype=np.int32),
+            np.ascontiguousarray(s, dtype=np.int8)
+        )
+
+        return float(h @ s.astype(np.float64)) + quadratic_energy
+
+    # Keep int8 spins as they are; evaluate any other values in float64 rather
+    # than truncating them.
+    s = np.ascontiguousarray(s, dtype=np.int8 if s.dtype == np.int8 else np.float64)
+
+    if Jc.size >= PARALLEL_THRESHOLD:
+        return float(_energy_parallel(*_contiguous(h, Jc, tail, head), s))
+    else:
+        return float(_energy_serial(*_contiguous(h, Jc, tail, head), s))
+
+
+@numba.njit("u8(u8)", cache=True)
+def _splitmix64(x):
+    """
+    Scramble a 64-bit integer, used to derive independent generator states.
+    """
+
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+@numba.njit("u8(u8)", cache=True)
+def _xorshift64(x):
+    """
+    Advance a xorshift64 generator state.
+    """
+
+    x ^= x << np.uint64(13)
+    x ^= x >> np.uint64(7)
+    x ^= x << np.uint64(17)
+    return x
+
+
+# Infinities are used for the running minima, so `nnan`/`ninf` are left out.
+@numba.njit(_SWEEP_SIGNATURES, cache=True, fastmath={"reassoc", "contract", "arcp", "nsz"}, parallel=True)
+def _sweep(h, Jc, tail, head, num_reads, seed, num_chunks):
+    """
+    Sample `num_reads` random assignments of spins, split into `num_chunks`
+    contiguous ranges of reads that each track their own minimum energy.
+    """
+
+    n = h.size
+    best = np.full(num_chunks, np.inf)
+
+    for c in numba.prange(num_chunks):
+        s = np.empty(n, dtype=np.int8)
+
+        for r in range(c * num_reads // num_chunks, (c + 1) * num_reads // num_chunks):
+            state = _splitmix64(np.uint64(seed) + np.uint64(r))
+            state = state if state != np.uint64(0) else np.uint64(1)
+            bits = np.uint64(0)
+            e = 0.0
+
+            # Draw one spin per random bit while accumulating the linear terms.
+            for i in range(n):
+                if i % 64 == 0:
+                    state = _xorshift64(state)
+                    bits = state
+
+                s[i] = np.int8(1) if bits & np.uint64(1) else np.int8(-1)
+                bits >>= np.uint64(1)
+                e += h[i] * s[i]
+
+            for k in range(Jc.size):
+                e += Jc[k] * s[tail[k]] * s[head[k]]
+
+            if e < best[c]:
+                best[c] = e
+
+    return best.min()
+
+
+def sweep(h: np.ndarray, Jc: np.ndarray, tail: np.ndarray, head: np.ndarray, num_reads: int, seed: int) -> float:
+    """
+    Sample `num_reads` uniformly random assignments of spins in parallel and
+    return the minimum energy found. Read `r` draws its spins from a xorshift64
+    generator seeded from `seed + r`, so results do not depend on the number
+    of threads.
+    """
+
+    num_chunks = max(1, min(numba.get_num_threads(), num_reads))
+    return float(_sweep(*_contiguous(h, Jc, tail, head), num_reads, seed, num_chunks))
@@ -1,8 +1,9 @@
 import argparse
 import os
-import bqpjson
-import json
-import re
+import numpy as np
+
+from _bqp_arrays import load_or_build
+from _energy_kernels import compute_energy
 
 
 def _read_assignment_values(path: str) -> list:
@@ -18,12 +19,16 @@ def _read_assignment_values(path: str) -> list:
         # Read the file as a string.
         file_string = f.read()
 
-        # Ensure file string contains a `BQP_SOLUTION` entry.
-        if "BQP_SOLUTION" not in file_string:
+        # Find the last `BQP_SOLUTION` entry, scanning backward from the end of
+        # the file, and ensure that it exists.
+        index = file_string.rfind("BQP_SOLUTION")
+
+        if index < 0:
             raise ValueError(f"No `BQP_SOLUTION` entry found in file: {path}")
 
         # Get the line corresponding to the `BQP_SOLUTION` entry.
-        line = re.findall("BQP_SOLUTION.*$", file_string, re.MULTILINE)[0]
+        end = file_string.find("\n", index)
+        line = file_string[index:end if end != -1 else None]
 
         # Extract the assignment of spins from the line.
         values = [float(x.strip().replace(' ', '')) for x in line.split(',')[5:]]
@@ -32,50 +37,22 @@ def _read_assignment_values(path: str) -> list:
     return values
 
 
-def _read_bqpjson(path: str) -> dict:
-    # Check for existence of the input file.
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"File not found: {path}")
-
-    # Read the input file and parse the JSON data.
-    with open(path, "r") as f:
-        data = json.load(f)
-
-    # Validate data against bqpjson schema.
-    bqpjson.validate(data)
-
-    # Return the parsed JSON data.
-    return data
-
-
-def _compute_energy(data: dict, assignment: dict) -> float:
-    """
-    Compute the energy of an assignment for a given Ising instance.
-    """
-
-    energy = sum(
-        lt["coeff"] * assignment[lt["id"]]
-        for lt in data["linear_terms"]
-    )
-
-    energy += sum(
-        qt["coeff"] * assignment[qt["id_tail"]] * assignment[qt["id_head"]]
-        for qt in data["quadratic_terms"]
-    )
-
-    return energy
-
-
-def evaluate_assignment(instance_path: str, result_path: str):
+def evaluate_assignment(instance_path: str, result_path: str, validate: bool = True):
     """
     Evaluate the energy of an assignment of spins, found in a result log file,
     for a given Ising instance, stored in a JSON file.
     """
 
-    data = _read_bqpjson(instance_path)
+    arrays = load_or_build(instance_path, validate)
     values = _read_assignment_values(result_path)
-    assignment = {vid: values[i] for (i, vid) in enumerate(data["variable_ids"])}
-    energy = _compute_energy(data, assignment)
+    h, Jc, tail, head = arrays["h"], arrays["Jc"], arrays["tail"], arrays["head"]
+
+    # Ensure the assignment has one value per variable of the instance.
+    if len(values) != h.size:
+        raise ValueError(f"Assignment has {len(values)} values, but the instance has {h.size} variables.")
+
+    s = np.asarray(values, dtype=np.float64)
+    energy = compute_energy(h, Jc, tail, head, s)
     print("Energy of assignment:", energy)
 
 
@@ -83,5 +60,6 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("-i", "--instance_path", help="path to instance", required=True)
     parser.add_argument("-r", "--result_path", help="path to result log", required=True)
+    parser.add_argument("--no-validate", help="skip bqpjson schema validation", action="store_true")
     args = parser.parse_args()
-    evaluate_assignment(args.instance_path, args.result_path)
+    evaluate_assignment(args.instance_path, args.result_path, not args.no_validate)
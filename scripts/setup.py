@@ -0,0 +1,15 @@
+# Builds the optional AVX2 energy kernel used by `_energy_kernels.py`. From the
+# `scripts` directory, execute `python3 setup.py build_ext --inplace`.
+from setuptools import Extension, setup
+
+
+setup(
+    name = "arxiv-2210.04291-scripts",
+    ext_modules = [
+        Extension(
+            "_energy_c",
+            sources = ["_energy_c.c"],
+            extra_compile_args = ["-O3"]
+        )
+    ]
+)
@@ -1,9 +1,11 @@
 import argparse
+import mmap
 import os
 import pandas as pd
-import re
 import tqdm
 
+from concurrent.futures import ProcessPoolExecutor
+
 
 def _get_total_time(log_text: str, is_dwave_qa: bool) -> float:
     """
@@ -20,53 +22,74 @@ def _get_total_time(log_text: str, is_dwave_qa: bool) -> float:
         return float(log_text.split(',')[7].strip())
 
 
-def _get_energy_and_solve_times(path: str) -> tuple:
+def _try_parse_log(path: str) -> tuple:
     """
-    Get important solution and timing data from the log file. Returns a tuple
-    containing the solve time, total wall-clock time, and best energy obtained.
+    Get important solution and timing data from the log file, opening it only
+    once. Returns a tuple containing the solve time, total wall-clock time, and
+    best energy obtained, or `None` if the file does not exist or does not
+    contain a `BQP_DATA` field. The file is memory-mapped rather than read, so
+    only the scanned pages are loaded.
     """
 
-    # Check for existence of the input file.
     if not os.path.exists(path):
-        raise FileNotFoundError(f"File not found: {path}")
+        return None
+
+    with open(path, "rb") as f:
+        # Empty files cannot be memory-mapped.
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
 
-    with open(path) as f:
-        # Read the file as a string.
-        file_string = f.read()
+        with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mm:
+            # Find the last `BQP_DATA` entry, scanning backward from the end.
+            index = mm.rfind(b"BQP_DATA")
 
-        # Ensure file string contains a `BQP_DATA` entry.
-        if "BQP_DATA" not in file_string:
-            raise ValueError(f"No `BQP_DATA` entry found in file: {path}")
+            if index < 0:
+                return None
 
-        # Get line corresponding to the `BQP_DATA` entry.
-        line = re.findall("BQP_DATA.*$", file_string, re.MULTILINE)[0]
+            # Get line corresponding to the `BQP_DATA` entry.
+            end = mm.find(b"\n", index)
+            line = mm[index:end if end != -1 else len(mm)].decode()
 
-        # Get measured energy, solve time, and total time.
-        energy = float(line.split(',')[3].strip())
-        solve_time = float(line.split(',')[7].strip())
-        is_dwave_qa = 'qa' in path and '_dwave_' in path
-        total_time = _get_total_time(line, is_dwave_qa)
+    # Get measured energy, solve time, and total time.
+    energy = float(line.split(',')[3].strip())
+    solve_time = float(line.split(',')[7].strip())
+    is_dwave_qa = 'qa' in path and '_dwave_' in path
+    total_time = _get_total_time(line, is_dwave_qa)
 
-        if total_time < solve_time:
-            # The "total time" should not be less than the "solve time," which
-            # does not include API-related execution time.
-            raise ValueError(f"Total time is less than solve time in {path}.")
+    if total_time < solve_time:
+        # The "total time" should not be less than the "solve time," which
+        # does not include API-related execution time.
+        raise ValueError(f"Total time is less than solve time in {path}.")
 
-        # Return solve time, total wall-clock time, and best energy obtained.
-        return solve_time, total_time, energy
+    # Return solve time, total wall-clock time, and best energy obtained.
+    return solve_time, total_time, energy
 
 
-def _path_has_bqp_data(path: str) -> bool:
+def _parse_one(task: tuple) -> dict:
     """
-    Check if the output file contains a `BQP_DATA` field.
+    Parse the log file of a `(solver, time_group, instance, path)` task. Returns
+    a row containing the solution data, or `None` if the log has no `BQP_DATA`
+    entry.
     """
 
-    if os.path.exists(path):
-        with open(path) as f:
-            file_string = f.read()
-            return "BQP_DATA" in file_string
-    else:
-        return False
+    solver, time_group, instance, path = task
+
+    # Get important solution and timing data from the log file.
+    parsed = _try_parse_log(path)
+
+    if parsed is None:
+        return None
+
+    solve_time, total_time, energy = parsed
+
+    return {
+        'instance': instance,
+        'solver': solver,
+        'time_group': time_group,
+        'energy': energy,
+        'solve_time': solve_time,
+        'total_time': total_time
+    }
 
 
 def _get_master_df(experiment_directory: str) -> pd.DataFrame:
@@ -74,52 +97,42 @@ def _get_master_df(experiment_directory: str) -> pd.DataFrame:
     Get a master dataframe containing all solution data.
     """
 
-    # Instantiate the dataframe where solution data will be stored.
-    df = pd.DataFrame(columns = ['instance', 'time_group', 'solver', 'energy', 'solve_time'])
+    # Instantiate the list of log files to be parsed.
+    tasks = []
 
     # Get all subdirectories containing solution data with the desired instance prefix.
-    subdirectories = [f.path for f in os.scandir(experiment_directory) if f.is_dir()]
-    solution_subdirectories = [f for f in subdirectories]
+    solution_subdirectories = [f for f in os.scandir(experiment_directory) if f.is_dir()]
 
-    for subdirectory in tqdm.tqdm(solution_subdirectories):
-       # Get important metadata by parsing the path of the file.
-       time_group = subdirectory.split('/')[-1].split('_')[-1]
-       solver = '_'.join(subdirectory.split('/')[-1].split('_')[:-1])
+    for subdirectory in solution_subdirectories:
+       # Get important metadata by parsing the name of the subdirectory.
+       solver, _, time_group = subdirectory.name.rpartition('_')
 
        # Get the directory containing the output fies in the subdirectory. There
        # should only be one directory in the subdirectory due to the structure.
-       directory = [f for f in os.scandir(subdirectory)][0].path
-       output_names = [f for f in os.listdir(directory) if '.stdout' in f]
-
-       for path in [os.path.join(directory, f) for f in output_names]:
-           if _path_has_bqp_data(path):
-                # Get important solution and timing data from the log file.
-                solve_time, total_time, energy = _get_energy_and_solve_times(path)
-
-                # Get the full instance name (e.g., `Pegasus-Lattice_Size-16_00027`).
-                instance = os.path.basename(path).replace('.stdout', '')
-
-                # Construct a new row to be appended to the dataframe.
-                new_row = pd.DataFrame(
-                    [
-                        {
-                            'instance': instance,
-                            'solver': solver,
-                            'time_group': time_group,
-                            'energy': energy,
-                            'solve_time': solve_time,
-                            'total_time': total_time
-                        }
-                    ]
-                )
-    
-                # Append the new row to the dataframe.
-                df = pd.concat(
-                    [
-                        df if not df.empty else None, new_row
-                    ],
-                    ignore_index = True
-                )
+       with os.scandir(subdirectory.path) as entries:
+           directory = next(entries).path
+
+       with os.scandir(directory) as entries:
+           for entry in entries:
+               if entry.name.endswith('.stdout'):
+                   # Get the full instance name (e.g., `Pegasus-Lattice_Size-16_00027`).
+                   instance = entry.name[:-len('.stdout')]
+                   tasks.append((solver, time_group, instance, entry.path))
+
+    # Parse the log files in parallel, one file per task.
+    with ProcessPoolExecutor(max_workers = os.cpu_count()) as executor:
+        results = list(
+            tqdm.tqdm(
+                executor.map(_parse_one, tasks, chunksize = 32),
+                total = len(tasks)
+            )
+        )
+
+    # Construct the master dataframe from all parsed rows at once.
+    df = pd.DataFrame(
+        [row for row in results if row is not None],
+        columns = ['instance', 'time_group', 'solver', 'energy', 'solve_time', 'total_time']
+    )
 
     # Return the master dataframe.
     return df
@@ -133,13 +146,19 @@ def tabulate_best_energies(experiment_directory: str, output_path: str):
     # Get the master dataframe containing all solution data.
     df = _get_master_df(experiment_directory)
 
+    # Use categorical group keys so that pivoting groups by integer codes.
+    df['instance'] = df['instance'].astype('category')
+    df['solver'] = df['solver'].astype('category')
+
     # Build a dataframe where columns are the solvers and rows are the
     # instances. For each instance, show the minimum energy for each solver.
+    # Only observed combinations of the categories are materialized.
     pivot_df = df.pivot_table(
         index = 'instance',
         columns = 'solver',
         values = 'energy',
-        aggfunc = 'min'
+        aggfunc = 'min',
+        observed = True
     )
 
     # Add a new column to the pivot table showing the best (minimum) energy